@@ -25,6 +25,7 @@ Optional Environment Variables:
     PORT         - Application port (default: 8080)
     API_KEY      - API key (default: empty)
     APP_ENV      - Application environment (default: development)
+    METRICS_*    - Metrics export settings, see metrics.py (default: disabled)
 
 Example .env file:
     DB_HOST=localhost
@@ -39,6 +40,7 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 import os
 from typing import Optional
+from metrics import REGISTRY, exporter_from_env
 
 # Load environment variables at module level
 load_dotenv()
@@ -79,6 +81,7 @@ class AppConfig:
     api_key: str
     environment: str
 
+@REGISTRY.timed('load_config')
 def load_config() -> AppConfig:
     """
     Load configuration from environment variables with defaults.
@@ -120,6 +123,7 @@ def main():
     1. Loads the configuration
     2. Prints all non-sensitive configuration values
     3. Masks sensitive values like passwords and API keys
+    4. Exports metrics if METRICS_ENABLED is set
     """
     # Load the configuration
     config = load_config()
@@ -138,5 +142,11 @@ def main():
     print(f"Username: {config.database.username}")
     print(f"Password: {'*' * len(config.database.password)}")
 
+    # Write the load_config() metrics recorded above
+    exporter = exporter_from_env()
+    if exporter:
+        exporter.stop()
+        print(f"\nMetrics written to {exporter.path}")
+
 if __name__ == "__main__":
     main()
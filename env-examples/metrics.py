@@ -0,0 +1,355 @@
+"""
+In-Process Metrics Example
+========================
+
+This example demonstrates a lightweight metrics registry that is configured
+through the same layered .env files as the other examples. It shows:
+
+1. Counters, gauges and histograms kept in process memory
+2. Per-thread aggregation, so hot paths never take a lock
+3. Periodic export to a local Prometheus-text or JSON file
+4. Instrumenting existing functions with a decorator
+
+Per-Thread Aggregation:
+--------------------
+Each thread updates its own shard of counters and histograms. Shards are
+registered once (under a lock) and merged only when metrics are collected,
+so recording a value is a plain dict update. When a thread exits, its shard
+is folded into a shared "retired" shard, so short-lived threads do not
+accumulate.
+
+Environment Variables:
+-------------------
+METRICS_ENABLED   - Turn the file exporter on (default: False)
+METRICS_PATH      - Output file (default: metrics.prom)
+METRICS_FORMAT    - 'prometheus' or 'json' (default: prometheus)
+METRICS_INTERVAL  - Seconds between exports (default: 15)
+
+Usage:
+-----
+from metrics import REGISTRY, exporter_from_env
+
+@REGISTRY.timed('my_function')
+def my_function(): ...
+
+exporter = exporter_from_env()   # after the .env files are loaded
+...
+if exporter:
+    exporter.stop()              # final export on shutdown
+
+Instrumented out of the box:
+-------------------------
+- load_environment() in multiple_env.py
+- load_config() in config_class.py
+
+Both scripts export the metrics on exit when METRICS_ENABLED is true.
+
+Opt-in:
+------
+- graph invoke() calls, only when the caller wraps the compiled graph with
+  instrument_graph(); the graph modules themselves are unchanged
+  (see langgraph-examples/instrumented_invoke.py)
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+
+# Upper bounds (seconds) for latency histograms
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+class _Shard:
+    """
+    Metrics recorded by a single thread.
+
+    Attributes:
+        counters (dict): Counter name -> value
+        histograms (dict): Histogram name -> [bucket counts, sum, count]
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+class _ThreadMarker:
+    """
+    Weak-referenceable object owned only by a thread's local storage.
+    """
+
+class MetricsRegistry:
+    """
+    Holds counters, gauges and histograms for the whole process.
+
+    Attributes:
+        buckets (tuple): Histogram bucket upper bounds
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._gauges = {}
+        # Totals from threads that have exited; only written under the lock
+        self._retired = _Shard()
+        self._shards = [self._retired]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        """
+        Returns the calling thread's shard, registering it on first use.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+
+            # The thread-local is cleared when the thread exits, which
+            # collects this marker and folds the shard into the retired one
+            marker = self._local.marker = _ThreadMarker()
+            weakref.finalize(marker, self._retire, shard)
+            return shard
+
+    def _retire(self, shard: _Shard):
+        """
+        Folds an exited thread's shard into the retired totals.
+        """
+        with self._lock:
+            self._merge(self._retired, shard)
+            self._shards.remove(shard)
+
+    def _merge(self, target: _Shard, shard: _Shard):
+        """
+        Adds a shard's counters and histograms into `target`.
+        """
+        for name, value in dict(shard.counters).items():
+            target.counters[name] = target.counters.get(name, 0) + value
+        for name, (counts, total, count) in dict(shard.histograms).items():
+            merged = target.histograms.setdefault(name, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], list(counts))]
+            merged[1] += total
+            merged[2] += count
+
+    def inc(self, name: str, value: float = 1):
+        """
+        Increments a counter.
+        """
+        counters = self._shard().counters
+        counters[name] = counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """
+        Sets a gauge to its latest value (last write wins across threads).
+        """
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        """
+        Records a value in a histogram.
+        """
+        histograms = self._shard().histograms
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        counts = histogram[0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def timed(self, name: str):
+        """
+        Decorator that counts calls, errors and latency of a function.
+
+        Records `{name}_calls_total`, `{name}_errors_total` and the
+        `{name}_seconds` histogram.
+
+        Example:
+            >>> @REGISTRY.timed('load_config')
+            ... def load_config(): ...
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    self.inc(f"{name}_errors_total")
+                    raise
+                finally:
+                    self.inc(f"{name}_calls_total")
+                    self.observe(f"{name}_seconds", time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def collect(self) -> dict:
+        """
+        Merges all thread shards into one view.
+
+        Shards are copied with dict()/list(), which are atomic under the GIL,
+        so collection never blocks the threads that record metrics. The lock
+        only keeps exiting threads from being retired mid-merge.
+
+        Returns:
+            dict: {"counters": ..., "gauges": ..., "histograms": ...}
+        """
+        total = _Shard()
+        with self._lock:
+            for shard in self._shards:
+                self._merge(total, shard)
+        counters = total.counters
+        histograms = total.histograms
+
+        return {
+            "counters": dict(sorted(counters.items())),
+            "gauges": dict(sorted(dict(self._gauges).items())),
+            "histograms": {
+                name: {
+                    "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], _cumulative(counts))),
+                    "sum": total,
+                    "count": count,
+                }
+                for name, (counts, total, count) in sorted(histograms.items())
+            },
+        }
+
+def _cumulative(counts: list) -> list:
+    """
+    Converts per-bucket counts to Prometheus-style cumulative counts.
+    """
+    running = 0
+    result = []
+    for count in counts:
+        running += count
+        result.append(running)
+    return result
+
+def to_prometheus(snapshot: dict) -> str:
+    """
+    Formats the output of `MetricsRegistry.collect` as Prometheus text.
+    """
+    lines = []
+    for name, value in snapshot["counters"].items():
+        lines += [f"# TYPE {name} counter", f"{name} {value}"]
+    for name, value in snapshot["gauges"].items():
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    for name, histogram in snapshot["histograms"].items():
+        lines.append(f"# TYPE {name} histogram")
+        for bound, count in histogram["buckets"].items():
+            lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+        lines += [f"{name}_sum {histogram['sum']}", f"{name}_count {histogram['count']}"]
+    return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    """
+    Writes the registry to a file at a fixed interval on a daemon thread.
+
+    Attributes:
+        path (Path): Output file, replaced atomically on every export
+        fmt (str): 'prometheus' or 'json'
+        interval (float): Seconds between exports
+    """
+
+    def __init__(self, registry: MetricsRegistry, path, fmt: str = 'prometheus', interval: float = 15.0):
+        if fmt not in ('prometheus', 'json'):
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        self.registry = registry
+        self.path = Path(path)
+        self.fmt = fmt
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-exporter', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the background thread and writes one final export.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.export()
+
+    def export(self):
+        """
+        Writes the current metrics to `path`.
+        """
+        snapshot = self.registry.collect()
+        if self.fmt == 'json':
+            text = json.dumps(snapshot, indent=2)
+        else:
+            text = to_prometheus(snapshot)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(text)
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # Keep exporting after transient failures such as a full disk
+            try:
+                self.export()
+            except OSError as e:
+                print(f"Metrics export to {self.path} failed: {e}", file=sys.stderr)
+
+def exporter_from_env(registry: MetricsRegistry = None):
+    """
+    Starts an exporter configured by the METRICS_* environment variables.
+
+    Call this after the .env files have been loaded.
+
+    Returns:
+        MetricsExporter: Running exporter, or None if METRICS_ENABLED is false
+    """
+    if os.getenv('METRICS_ENABLED', 'False').lower() != 'true':
+        return None
+    return MetricsExporter(
+        registry or REGISTRY,
+        path=os.getenv('METRICS_PATH', 'metrics.prom'),
+        fmt=os.getenv('METRICS_FORMAT', 'prometheus'),
+        interval=float(os.getenv('METRICS_INTERVAL', '15')),
+    ).start()
+
+def instrument_graph(app, name: str, registry: MetricsRegistry = None):
+    """
+    Wraps a compiled graph so every `invoke` is timed.
+
+    Records `graph_{name}_invoke_calls_total`, `graph_{name}_invoke_errors_total`
+    and the `graph_{name}_invoke_seconds` histogram.
+
+    Args:
+        app: Compiled graph returned by `workflow.compile()`
+        name (str): Graph name used in the metric names
+
+    Returns:
+        Object with the same interface as `app`
+    """
+    return _InstrumentedGraph(app, (registry or REGISTRY).timed(f"graph_{name}_invoke"))
+
+class _InstrumentedGraph:
+    """
+    Forwards to a compiled graph, timing `invoke`.
+    """
+
+    def __init__(self, app, timer):
+        self._app = app
+        self.invoke = timer(app.invoke)
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+# Process-wide registry used by the instrumented examples
+REGISTRY = MetricsRegistry()
@@ -32,6 +32,11 @@ Usage:
 2. Run the script:
    python multiple_env.py
 
+Metrics:
+-------
+load_environment() is instrumented with the registry from metrics.py.
+Set METRICS_ENABLED=True in an env file to write the metrics on exit.
+
 Requirements:
 -----------
 - python-dotenv package: pip install python-dotenv
@@ -40,7 +45,9 @@ Requirements:
 from dotenv import load_dotenv
 import os
 from pathlib import Path
+from metrics import REGISTRY, exporter_from_env
 
+@REGISTRY.timed('load_environment')
 def load_environment(env_name: str = 'development'):
     """
     Load environment variables from multiple .env files.
@@ -113,6 +120,7 @@ def main():
     1. Loads each environment configuration in sequence
     2. Displays the resulting configuration for each environment
     3. Shows how values override each other based on precedence
+    4. Exports metrics if METRICS_ENABLED is set by the loaded files
     """
     # Example: Load different environments
     environments = ['development', 'testing', 'production']
@@ -131,5 +139,11 @@ def main():
             else:
                 print(f"{key}: {value}")
 
+    # Write collected metrics using the settings of the last environment
+    exporter = exporter_from_env()
+    if exporter:
+        exporter.stop()
+        print(f"\nMetrics written to {exporter.path}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+"""
+Shared argparse Types for the Example Scripts
+==========================================
+
+Small `type=` functions used by the benchmark and profiling examples, so
+bad numbers are reported as usage errors instead of tracebacks.
+
+Usage:
+-----
+from cli_types import positive_int
+
+parser.add_argument('--runs', type=positive_int, default=10)
+"""
+
+import argparse
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for counts that must be at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def non_negative_float(value: str) -> float:
+    """
+    argparse type for durations that must be zero or more.
+    """
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+    return number
@@ -0,0 +1,366 @@
+"""
+Columnar Result Sink Example
+==========================
+
+This example shows how to store the final states of many graph runs in a
+compact binary columnar file instead of a list of dicts or JSONL. It uses
+the `counter` and `two_step` graphs as the source of batch results.
+
+File Layout:
+----------
+    header:  magic | schema length (u32) | schema (JSON)
+    chunk:   row count (u32) | byte length per column (u64 each) | column data
+
+    int column:  row count x int64
+    str column:  (row count + 1) x int64 offsets | UTF-8 bytes
+
+Key Concepts:
+-----------
+1. Appending in Chunks
+   - Each `append` call writes one self-describing chunk
+   - An existing file can be reopened and appended to
+   - A torn chunk from an interrupted append is ignored by readers and
+     truncated away by the next writer
+
+2. Column Reads Without a Full Load
+   - The reader memory-maps the file
+   - Only chunk headers and string offsets are checked up front
+   - `read_column` touches the bytes of a single column
+
+Usage:
+-----
+python columnar_sink.py
+python columnar_sink.py --rows 20000 --chunk-size 5000
+
+Expected Output:
+    File sizes and read/write throughput for the columnar file vs JSONL
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+from cli_types import positive_int
+
+MAGIC = b"GRAPHCOL"
+
+# Column schemas for the final states of each example graph
+SCHEMAS = {
+    "counter": [("start", "int"), ("count", "int")],
+    "two_step": [("number", "int"), ("doubled", "int"), ("message", "str")],
+    "basic_greeting": [("name", "str"), ("message", "str")],
+}
+
+def _int64_bytes(values) -> bytes:
+    """
+    Packs integers as little-endian int64.
+    """
+    column = array("q", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+def _int64_array(data) -> array:
+    """
+    Unpacks little-endian int64 bytes into an array.
+    """
+    column = array("q")
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+class ColumnarWriter:
+    """
+    Appends rows to a columnar file, one chunk per `append` call.
+
+    Attributes:
+        path (Path): File being written
+        schema (list): (column name, "int" or "str") pairs
+    """
+
+    def __init__(self, path, schema: list):
+        # _end is the offset just past the last complete chunk
+        self.path = Path(path)
+        self.schema = [tuple(column) for column in schema]
+
+        if self.path.exists() and self.path.stat().st_size:
+            existing = ColumnarReader(self.path)
+            try:
+                if existing.schema != self.schema:
+                    raise ValueError(f"Schema mismatch for {self.path}: {existing.schema}")
+                self._end = existing.end
+            finally:
+                existing.close()
+        else:
+            schema_json = json.dumps(self.schema).encode("utf-8")
+            with open(self.path, "wb") as f:
+                f.write(MAGIC + struct.pack("<I", len(schema_json)) + schema_json)
+                self._end = f.tell()
+
+    def append(self, rows: list):
+        """
+        Writes rows (dicts keyed by column name) as a single chunk.
+
+        Args:
+            rows (list): Final states to store; extra keys are ignored
+        """
+        if not rows:
+            return
+
+        columns = []
+        for name, kind in self.schema:
+            if kind == "int":
+                columns.append(_int64_bytes(row[name] for row in rows))
+            else:
+                encoded = [row[name].encode("utf-8") for row in rows]
+                offsets = [0]
+                for value in encoded:
+                    offsets.append(offsets[-1] + len(value))
+                columns.append(_int64_bytes(offsets) + b"".join(encoded))
+
+        header = struct.pack(f"<I{len(columns)}Q", len(rows), *(len(c) for c in columns))
+        if self.path.stat().st_size < self._end:
+            # Cut short since our last append; find the last complete chunk again
+            with ColumnarReader(self.path) as existing:
+                self._end = existing.end
+
+        with open(self.path, "r+b") as f:
+            # Drop any torn chunk left by an interrupted append before writing
+            f.seek(self._end)
+            f.truncate()
+            f.write(header)
+            for column in columns:
+                f.write(column)
+            f.flush()
+            # Only a fully written chunk moves the end offset forward
+            self._end = f.tell()
+
+class ColumnarReader:
+    """
+    Memory-maps a columnar file and reads individual columns.
+
+    Attributes:
+        schema (list): (column name, "int" or "str") pairs
+        rows (int): Total number of rows across all complete chunks
+        end (int): File offset just past the last complete chunk
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a columnar result file")
+
+        try:
+            self._index(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _index(self, path):
+        """
+        Parses the schema and chunk headers, stopping at the last complete chunk.
+
+        Raises:
+            ValueError: If the header or a complete chunk is malformed
+        """
+        size = len(self._map)
+        position = len(MAGIC) + 4
+        if size < position or self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a columnar result file")
+        (schema_len,) = struct.unpack_from("<I", self._map, len(MAGIC))
+        if position + schema_len > size:
+            raise ValueError(f"{path} has a truncated schema header")
+        self.schema = [tuple(c) for c in json.loads(self._map[position:position + schema_len])]
+        position += schema_len
+
+        # Index chunk headers only: (row count, [(offset, length) per column])
+        chunk_header = struct.Struct(f"<I{len(self.schema)}Q")
+        self._chunks = []
+        while position + chunk_header.size <= size:
+            row_count, *lengths = chunk_header.unpack_from(self._map, position)
+            data_at = position + chunk_header.size
+            if data_at + sum(lengths) > size:
+                break  # Torn chunk from an interrupted append
+
+            spans = []
+            for (name, kind), length in zip(self.schema, lengths):
+                minimum = row_count * 8 if kind == "int" else (row_count + 1) * 8
+                if length < minimum or (kind == "int" and length != minimum):
+                    raise ValueError(f"{path} has a corrupt chunk at offset {position} (column {name})")
+                if kind == "str":
+                    self._check_offsets(path, name, position, data_at, length, row_count)
+                spans.append((data_at, length))
+                data_at += length
+            self._chunks.append((row_count, spans))
+            position = data_at
+
+        # Offset just past the last complete chunk; bytes after it are a torn tail
+        self.end = position
+        self.rows = sum(row_count for row_count, _ in self._chunks)
+
+    def _check_offsets(self, path, name, position, offset, length, row_count):
+        """
+        Ensures a string column's offsets start at 0, never decrease and end
+        exactly at the blob length.
+
+        Raises:
+            ValueError: If the offsets do not describe the blob
+        """
+        offsets_size = (row_count + 1) * 8
+        offsets = _int64_array(self._map[offset:offset + offsets_size])
+        valid = (
+            offsets[0] == 0
+            and offsets[-1] == length - offsets_size
+            and all(a <= b for a, b in zip(offsets, offsets[1:]))
+        )
+        if not valid:
+            raise ValueError(f"{path} has corrupt string offsets at offset {position} (column {name})")
+
+    def read_column(self, name: str) -> list:
+        """
+        Reads one column across all chunks.
+
+        Args:
+            name (str): Column name from the schema
+
+        Returns:
+            list: Column values in row order
+        """
+        names = [column for column, _ in self.schema]
+        index = names.index(name)
+        kind = self.schema[index][1]
+
+        values = []
+        for row_count, spans in self._chunks:
+            offset, length = spans[index]
+            if kind == "int":
+                values.extend(_int64_array(self._map[offset:offset + length]))
+            else:
+                offsets_size = (row_count + 1) * 8
+                offsets = _int64_array(self._map[offset:offset + offsets_size])
+                blob = self._map[offset + offsets_size:offset + length]
+                values.extend(
+                    blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(row_count)
+                )
+        return values
+
+    def read_rows(self) -> list:
+        """
+        Reads every column and rebuilds the rows as dicts.
+        """
+        names = [column for column, _ in self.schema]
+        columns = [self.read_column(name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def close(self):
+        """
+        Releases the memory map and file handle.
+        """
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def benchmark(rows: list, schema: list, chunk_size: int, workdir: Path) -> dict:
+    """
+    Compares the columnar sink against JSONL for the given results.
+
+    Args:
+        rows (list): Final states to store
+        schema (list): Columnar schema matching the rows
+        chunk_size (int): Rows per appended chunk
+        workdir (Path): Directory for the output files
+
+    Returns:
+        dict: Size and timings (seconds) per format
+    """
+    columnar_path = workdir / "results.col"
+    jsonl_path = workdir / "results.jsonl"
+    first_int = next(name for name, kind in schema if kind == "int")
+    report = {}
+
+    start = time.perf_counter()
+    writer = ColumnarWriter(columnar_path, schema)
+    for i in range(0, len(rows), chunk_size):
+        writer.append(rows[i:i + chunk_size])
+    write_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ColumnarReader(columnar_path) as reader:
+        assert reader.read_rows() == rows
+    read_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ColumnarReader(columnar_path) as reader:
+        reader.read_column(first_int)
+    column_time = time.perf_counter() - start
+
+    report["columnar"] = (columnar_path.stat().st_size, write_time, read_time, column_time)
+
+    start = time.perf_counter()
+    with open(jsonl_path, "w") as f:
+        for i in range(0, len(rows), chunk_size):
+            f.writelines(json.dumps(row) + "\n" for row in rows[i:i + chunk_size])
+    write_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(jsonl_path) as f:
+        assert [json.loads(line) for line in f] == rows
+    read_time = time.perf_counter() - start
+
+    # JSONL has no way to skip other fields, so a column read parses everything
+    start = time.perf_counter()
+    with open(jsonl_path) as f:
+        [json.loads(line)[first_int] for line in f]
+    column_time = time.perf_counter() - start
+
+    report["jsonl"] = (jsonl_path.stat().st_size, write_time, read_time, column_time)
+    return report
+
+def main():
+    """
+    Runs the example graphs in batch and benchmarks both sinks.
+    """
+    from counter import app as counter_app
+    from two_step import app as two_step_app
+
+    parser = argparse.ArgumentParser(description='Benchmark a columnar result sink against JSONL')
+    parser.add_argument('--rows', type=positive_int, default=5000, help='Graph runs per workflow (default: 5000)')
+    parser.add_argument('--chunk-size', type=positive_int, default=1000, help='Rows per chunk (default: 1000)')
+    args = parser.parse_args()
+
+    batches = {
+        "counter": (counter_app, [{"start": i} for i in range(args.rows)]),
+        "two_step": (two_step_app, [{"number": i} for i in range(args.rows)]),
+    }
+
+    for name, (graph, inputs) in batches.items():
+        rows = graph.batch(inputs)
+        with tempfile.TemporaryDirectory() as workdir:
+            report = benchmark(rows, SCHEMAS[name], args.chunk_size, Path(workdir))
+
+        print(f"\n=== {name}: {len(rows)} rows ===")
+        print(f"{'format':>10} {'bytes':>10} {'write r/s':>12} {'read r/s':>12} {'column r/s':>12}")
+        for label, (size, write_time, read_time, column_time) in report.items():
+            print(
+                f"{label:>10} {size:>10} {len(rows) / write_time:>12.0f} "
+                f"{len(rows) / read_time:>12.0f} {len(rows) / column_time:>12.0f}"
+            )
+
+if __name__ == "__main__":
+    main()
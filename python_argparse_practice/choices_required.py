@@ -5,6 +5,8 @@ Example showing required arguments and choices in argparse.
 Example usage:
     python choices_required.py --color red --size large
     python choices_required.py --color blue --size medium
+
+For choice sets with thousands of entries, see large_choices.py.
 """
 
 import argparse
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Example showing fast validation and completion for large choice sets.
+
+`choices=[...]` works well for a handful of values, but argparse checks it
+with a linear scan and lists every choice in its error message. For choice
+sets with thousands of entries loaded from a file, this example builds an
+index once and caches it on disk next to the file (`<file>.idx`):
+
+- a hash table, so membership checks are O(1)
+- a sorted list of names, so prefix completion is a binary search
+
+The cache is memory-mapped, so neither structure is loaded in full.
+
+Example usage:
+    python large_choices.py --regions-file regions.txt --region eu-west-1
+    python large_choices.py --regions-file regions.txt --complete eu-
+    python large_choices.py --benchmark
+"""
+
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+MAGIC = b"CHOICES1"
+
+# All fields are little-endian with fixed widths, so a cache written on one
+# machine reads the same on another:
+#   header:  magic | source size | source mtime (ns) | entry count | hash table slots
+#   offsets: (count + 1) x u64, hash table: slots x u32, then the UTF-8 names
+HEADER = struct.Struct("<8sQQQQ")
+OFFSET = struct.Struct("<Q")
+SLOT = struct.Struct("<I")
+
+EMPTY_SLOT = 0xFFFFFFFF
+
+def _expected_size(cache) -> int:
+    """
+    Size a cache must have according to its header, or -1 if unreadable.
+    """
+    if len(cache) < HEADER.size:
+        return -1
+    _, _, _, count, slots = HEADER.unpack_from(cache)
+    last_offset_at = HEADER.size + count * OFFSET.size
+    if last_offset_at + 8 > len(cache):
+        return -1
+    (names_size,) = OFFSET.unpack_from(cache, last_offset_at)
+    return HEADER.size + (count + 1) * OFFSET.size + slots * SLOT.size + names_size
+
+class _SortedNames:
+    """
+    Sequence view over the sorted names, so `bisect` can search the cache.
+    """
+
+    def __init__(self, index):
+        self._index = index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, i):
+        return self._index.name_at(i)
+
+class ChoiceIndex:
+    """
+    Memory-mapped hash and sorted index over a file of choices.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.cache_path = path + '.idx'
+        if not self._open_fresh_cache():
+            self._build_cache()
+            if not self._open_fresh_cache():
+                raise ValueError(f"{self.cache_path} is incomplete or corrupt")
+        _, _, _, self._count, self._slots = HEADER.unpack_from(self._map)
+
+        # Layout after the header: offsets | hash table | names
+        self._offsets_at = HEADER.size
+        self._table_at = self._offsets_at + (self._count + 1) * OFFSET.size
+        self._names_at = self._table_at + self._slots * SLOT.size
+
+    def _open_fresh_cache(self) -> bool:
+        """
+        Maps the cache if it matches the choices file, reading only the
+        header and the last offset; returns False if it must be rebuilt.
+        """
+        stat = os.stat(self.path)
+        try:
+            self._file = open(self.cache_path, 'rb')
+        except FileNotFoundError:
+            return False
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            return False
+
+        # The cache is rebuilt whenever the choices file changes
+        fresh = _expected_size(self._map) == len(self._map)
+        if fresh:
+            magic, size, mtime, _, _ = HEADER.unpack_from(self._map)
+            fresh = magic == MAGIC and size == stat.st_size and mtime == stat.st_mtime_ns
+        if not fresh:
+            self.close()
+        return fresh
+
+    def _build_cache(self):
+        stat = os.stat(self.path)
+        with open(self.path, encoding='utf-8') as f:
+            names = sorted({line.strip() for line in f if line.strip()})
+        encoded = [name.encode('utf-8') for name in names]
+
+        offsets = [0]
+        for name in encoded:
+            offsets.append(offsets[-1] + len(name))
+
+        # Open addressing with linear probing, at most half full
+        slots = 1
+        while slots < 2 * len(encoded):
+            slots *= 2
+        table = [EMPTY_SLOT] * slots
+        for i, name in enumerate(encoded):
+            slot = zlib.crc32(name) & (slots - 1)
+            while table[slot] != EMPTY_SLOT:
+                slot = (slot + 1) & (slots - 1)
+            table[slot] = i
+
+        # Write to a unique temporary file first, so concurrent cold starts
+        # never share a partial cache; the last os.replace wins
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_path) or '.',
+                                        prefix=os.path.basename(self.cache_path) + '.')
+        try:
+            os.fchmod(fd, 0o644)  # mkstemp creates 0600; other users read the cache too
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, len(encoded), slots))
+                f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+                f.write(struct.pack(f'<{slots}I', *table))
+                f.write(b''.join(encoded))
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def __len__(self):
+        return self._count
+
+    def _name_bytes(self, i: int) -> bytes:
+        start, end = struct.unpack_from('<QQ', self._map, self._offsets_at + i * OFFSET.size)
+        return self._map[self._names_at + start:self._names_at + end]
+
+    def name_at(self, i: int) -> str:
+        """Return the i-th name in sorted order."""
+        return self._name_bytes(i).decode('utf-8')
+
+    def __contains__(self, value: str) -> bool:
+        encoded = value.encode('utf-8')
+        mask = self._slots - 1
+        slot = zlib.crc32(encoded) & mask
+        while True:
+            (i,) = SLOT.unpack_from(self._map, self._table_at + slot * SLOT.size)
+            if i == EMPTY_SLOT:
+                return False
+            if self._name_bytes(i) == encoded:
+                return True
+            slot = (slot + 1) & mask
+
+    def complete(self, prefix: str, limit: int = 20) -> list:
+        """Return up to `limit` names starting with `prefix`, in sorted order."""
+        names = _SortedNames(self)
+        i = bisect.bisect_left(names, prefix)
+        matches = []
+        while i < len(names) and len(matches) < limit:
+            name = names[i]
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+            i += 1
+        return matches
+
+    def validate(self, value: str) -> str:
+        """argparse `type=` function: accept known names only."""
+        if value in self:
+            return value
+        # Suggest names sharing the longest prefix with the value
+        suggestions = []
+        for length in range(len(value), 0, -1):
+            suggestions = self.complete(value[:length], limit=5)
+            if suggestions:
+                break
+        hint = f" (did you mean: {', '.join(suggestions)}?)" if suggestions else ''
+        raise argparse.ArgumentTypeError(f"invalid choice: {value!r}{hint}")
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+def benchmark():
+    """Compare list-based `choices` with ChoiceIndex at 10k and 100k names."""
+    repeats = 200
+    for size in (10_000, 100_000):
+        names = [f"tenant-{i:06d}" for i in range(size)]
+        target = names[-1]  # worst case for a linear scan
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'choices.txt')
+            with open(path, 'w') as f:
+                f.write('\n'.join(names))
+
+            start = time.perf_counter()
+            ChoiceIndex(path).close()
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index = ChoiceIndex(path)
+            load = time.perf_counter() - start
+
+            list_parser = argparse.ArgumentParser()
+            list_parser.add_argument('--tenant', choices=names)
+            index_parser = argparse.ArgumentParser()
+            index_parser.add_argument('--tenant', type=index.validate)
+
+            timings = {}
+            for label, parser in (('choices=list', list_parser), ('ChoiceIndex', index_parser)):
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    parser.parse_args(['--tenant', target])
+                timings[label] = (time.perf_counter() - start) / repeats
+
+            prefix = target[:-2]
+            start = time.perf_counter()
+            for _ in range(repeats):
+                [name for name in names if name.startswith(prefix)][:20]
+            scan_complete = (time.perf_counter() - start) / repeats
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                index.complete(prefix)
+            index_complete = (time.perf_counter() - start) / repeats
+            index.close()
+
+        print(f"=== {size} choices ===")
+        print(f"Index build (cold): {build * 1000:.1f} ms, cached load: {load * 1000:.3f} ms")
+        for label, seconds in timings.items():
+            print(f"Parse with {label}: {seconds * 1e6:.1f} us")
+        print(f"Completion, linear scan: {scan_complete * 1e6:.1f} us")
+        print(f"Completion, ChoiceIndex: {index_complete * 1e6:.1f} us\n")
+
+def main():
+    # First pass: find the file the choices come from
+    # (no abbreviations, or --region would be taken for --regions-file)
+    file_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    file_parser.add_argument(
+        '--regions-file',
+        help='File with one region name per line'
+    )
+    file_parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Benchmark parse and completion latency at 10k and 100k choices'
+    )
+    known, _ = file_parser.parse_known_args()
+
+    if known.benchmark:
+        benchmark()
+        return
+
+    # Second pass: the full parser, validating against the index
+    parser = argparse.ArgumentParser(
+        description='Demonstrating validation and completion for large choice sets',
+        parents=[file_parser]
+    )
+    if not known.regions_file:
+        parser.parse_known_args()  # still show -h before failing
+        parser.error('--regions-file is required')
+    try:
+        index = ChoiceIndex(known.regions_file)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot read --regions-file: {e}")
+
+    # Mutually exclusive: pick a region, or list completions for a prefix
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        '--region',
+        type=index.validate,
+        metavar='NAME',
+        help=f'Select one of {len(index)} regions'
+    )
+    group.add_argument(
+        '--complete',
+        metavar='PREFIX',
+        help='Print regions starting with PREFIX (for shell completion)'
+    )
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    if args.complete is not None:
+        print('\n'.join(index.complete(args.complete)))
+    else:
+        print(f"You selected region: {args.region}")
+    index.close()
+
+if __name__ == '__main__':
+    main()